@@ -7,17 +7,28 @@ import socket
 import re
 import json
 import platform
-from netifaces import interfaces, ifaddresses, AF_INET
+from netifaces import interfaces, ifaddresses, AF_INET, AF_INET6
 from datetime import datetime
 from pyfiglet import Figlet
 import random
 import webbrowser
 import geoip2.database
-import whois
+import maxminddb
+import numpy as np
 import dns.resolver
 import csv
+import argparse
+import atexit
+import tempfile
+import hashlib
+import math
+import itertools
+import sqlite3
 import logging
-from concurrent.futures import ThreadPoolExecutor
+import ipaddress
+import threading
+from urllib.parse import urlparse, urljoin
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import subprocess
 from tqdm import tqdm
 from typing import Dict, List, Optional, Tuple
@@ -25,12 +36,49 @@ from typing import Dict, List, Optional, Tuple
 
 class CosmicConfig:
     GEOIP_DATABASE = "GeoLite2-City.mmdb"
+    GEOIP_ASN_DATABASE = "GeoLite2-ASN.mmdb"
+    GEO_TABLE_CACHE = "geo_range_tables.npz"
+    BULK_GEO_CHUNK = 500000
     MAP_PROVIDER = "https://www.google.com/maps?q={lat},{lon}"
     IP_API_URL = "http://ip-api.com/json/{ip}?fields=66846719"
+    IP_API_MIN_INTERVAL = 60 / 45  # free tier allows 45 requests per minute
     PUBLIC_IP_CHECK = "https://api.ipify.org?format=json"
+    # (url, JSON key holding the address) for each public IP provider
+    PUBLIC_IP_SERVICES = [
+        ("https://api.ipify.org?format=json", "ip"),
+        ("https://ipinfo.io/json", "ip"),
+        ("https://ifconfig.me/all.json", "ip_addr")
+    ]
+    PUBLIC_IP_TIMEOUT = 3
+    PUBLIC_IP_TTL = 300
+    PUBLIC_IP_RACE = 2
+    PUBLIC_IP_CONFIRM_WAIT = 1.0
+    PUBLIC_IP_UNCONFIRMED_TTL = 60
     LOG_FILE = "ip_tracker_logs.json"
     EXPORT_DIR = "ip_reports"
+    DELTA_LOG = "ip_deltas.jsonl"
+    WATCH_POLL_INTERVAL = 2
+    WATCH_ENRICH_TTL = 7 * 86400
+    WATCH_BLOOM_CAPACITY = 1000000
+    WATCH_BLOOM_ERROR_RATE = 0.001
+    WATCH_STATE_DB = "watch_state.sqlite3"
+    WATCH_TRACEROUTE = False
+    WATCH_BATCH_SIZE = 256
     TRACEROUTE_MAX_HOPS = 30
+    TRACEROUTE_MAX_SILENT_HOPS = 5
+    PATH_STORE_FILE = "traceroute_paths.json"
+    PATH_STORE_SAVE_INTERVAL = 30
+    RDAP_BOOTSTRAP_URLS = {
+        4: "https://data.iana.org/rdap/ipv4.json",
+        6: "https://data.iana.org/rdap/ipv6.json"
+    }
+    RDAP_FALLBACK_URL = "https://rdap.arin.net/registry/"
+    WHOIS_ROOT_SERVER = "whois.iana.org"
+    WHOIS_TIMEOUT = 8
+    WHOIS_MAX_REFERRALS = 4
+    WHOIS_PER_REGISTRY_LIMIT = 2
+    WHOIS_MAX_WORKERS = 8
+    WHOIS_CACHE_TTL = 86400
 
 
 class QuantumMagic:
@@ -77,7 +125,598 @@ class StellarColors:
     RAINBOW = QuantumMagic.quantum_rainbow
 
 
+class NebulaRegistry:
+    """Network-registration lookups for IP addresses via RDAP, with whois fallback.
+
+    Queries go straight to the regional registry that owns the address (found
+    through the IANA RDAP bootstrap files, or IANA whois referrals), follow
+    registry referrals, and never open more than WHOIS_PER_REGISTRY_LIMIT
+    connections to the same registry at once. Answers are cached per allocated
+    network block, so any other address inside a cached block is served locally.
+    """
+
+    WHOIS_FIELDS = {
+        'network_name': ('netname', 'NetName'),
+        'handle': ('NetHandle', 'inetnum', 'inet6num'),
+        'country': ('country', 'Country'),
+        'org': ('Organization', 'OrgName', 'owner', 'descr'),
+        'creation_date': ('RegDate', 'created'),
+        'last_changed': ('Updated', 'last-modified', 'changed')
+    }
+    WHOIS_REFERRAL_KEYS = ('refer', 'ReferralServer', 'whois')
+    WHOIS_NETWORK_KEYS = ('NetRange', 'inetnum', 'inet6num')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._registry_slots = {}
+        self._bootstrap = {}
+        # Per IP version: {prefixlen: {network address as int: (expiry, data)}}
+        self._blocks = {4: {}, 6: {}}
+        self._session = requests.Session()
+        self._session.headers['User-Agent'] = 'CosmicIPTracker/3.0'
+
+    # ---------- cache ----------
+    def cached(self, ip):
+        address = ipaddress.ip_address(ip)
+        value = int(address)
+        with self._lock:
+            blocks = self._blocks[address.version]
+            # Most specific block wins, same as the registries' own answers
+            for prefixlen in sorted(blocks, reverse=True):
+                shift = address.max_prefixlen - prefixlen
+                entry = blocks[prefixlen].get(value >> shift << shift)
+                if entry:
+                    return dict(entry[1], cached=True) if entry[0] > time.time() else None
+        return None
+
+    def _remember(self, data):
+        # A referral that failed part-way leaves a coarse block; don't let it shadow the real one
+        if data.get('partial'):
+            return
+        try:
+            networks = ipaddress.summarize_address_range(
+                ipaddress.ip_address(data['start_address']),
+                ipaddress.ip_address(data['end_address']))
+            networks = list(networks)
+        except (KeyError, TypeError, ValueError):
+            return
+        expires = time.time() + CosmicConfig.WHOIS_CACHE_TTL
+        with self._lock:
+            for network in networks:
+                blocks = self._blocks[network.version].setdefault(network.prefixlen, {})
+                blocks[int(network.network_address)] = (expires, data)
+
+    # ---------- throttling ----------
+    def _registry_slot(self, host):
+        with self._lock:
+            if host not in self._registry_slots:
+                self._registry_slots[host] = threading.BoundedSemaphore(CosmicConfig.WHOIS_PER_REGISTRY_LIMIT)
+            return self._registry_slots[host]
+
+    # ---------- RDAP ----------
+    def _rdap_base_url(self, address):
+        version = address.version
+        with self._lock:
+            services = self._bootstrap.get(version)
+        if services is None:
+            try:
+                response = self._session.get(CosmicConfig.RDAP_BOOTSTRAP_URLS[version],
+                                             timeout=CosmicConfig.WHOIS_TIMEOUT)
+                services = [
+                    ([ipaddress.ip_network(prefix) for prefix in prefixes], urls)
+                    for prefixes, urls in response.json().get('services', [])
+                ]
+            except Exception:
+                # Don't cache the failure; the next lookup retries the bootstrap
+                return CosmicConfig.RDAP_FALLBACK_URL
+            with self._lock:
+                self._bootstrap[version] = services
+        best = None
+        for networks, urls in services:
+            for network in networks:
+                if address in network and (best is None or network.prefixlen > best[0]):
+                    https = [url for url in urls if url.startswith('https')]
+                    best = (network.prefixlen, (https or urls)[0])
+        return best[1] if best else CosmicConfig.RDAP_FALLBACK_URL
+
+    def _rdap_lookup(self, address):
+        base = self._rdap_base_url(address)
+        url = f"{base.rstrip('/')}/ip/{address}"
+        for _ in range(CosmicConfig.WHOIS_MAX_REFERRALS + 1):
+            host = urlparse(url).hostname
+            with self._registry_slot(host):
+                response = self._session.get(url, timeout=CosmicConfig.WHOIS_TIMEOUT,
+                                             allow_redirects=False,
+                                             headers={'Accept': 'application/rdap+json'})
+            if response.is_redirect and 'Location' in response.headers:
+                url = urljoin(url, response.headers['Location'])
+                continue
+            response.raise_for_status()
+            return self._parse_rdap(response.json(), host)
+        raise RuntimeError("too many RDAP referrals")
+
+    @staticmethod
+    def _parse_rdap(record, host):
+        data = {
+            'source': 'RDAP',
+            'registry': host,
+            'network_name': record.get('name'),
+            'handle': record.get('handle'),
+            'country': record.get('country'),
+            'org': None,
+            'start_address': record.get('startAddress'),
+            'end_address': record.get('endAddress'),
+            'cidr': None,
+            'creation_date': None,
+            'last_changed': None
+        }
+        cidrs = record.get('cidr0_cidrs') or []
+        if cidrs:
+            data['cidr'] = [
+                f"{c.get('v4prefix') or c.get('v6prefix')}/{c.get('length')}" for c in cidrs
+            ]
+        for event in record.get('events', []):
+            if event.get('eventAction') == 'registration':
+                data['creation_date'] = event.get('eventDate')
+            elif event.get('eventAction') == 'last changed':
+                data['last_changed'] = event.get('eventDate')
+        for entity in record.get('entities', []):
+            if 'registrant' in entity.get('roles', []):
+                for field in (entity.get('vcardArray') or [None, []])[1]:
+                    if field[0] == 'fn':
+                        data['org'] = field[3]
+                        break
+        return data
+
+    # ---------- whois (port 43) ----------
+    def _whois_query(self, host, query, port=43):
+        with self._registry_slot(host):
+            with socket.create_connection((host, port), timeout=CosmicConfig.WHOIS_TIMEOUT) as sock:
+                sock.sendall(f"{query}\r\n".encode())
+                chunks = []
+                while True:
+                    chunk = sock.recv(4096)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+        return b''.join(chunks).decode('utf-8', errors='replace')
+
+    @staticmethod
+    def _whois_referral(objects):
+        """Return (host, port) of the next whois server, or None; rwhois referrals are not followed"""
+        for fields in objects:
+            for key in NebulaRegistry.WHOIS_REFERRAL_KEYS:
+                referral = fields.get(key)
+                if not referral:
+                    continue
+                scheme, _, rest = referral.rpartition('://')
+                if scheme and scheme.lower() != 'whois':
+                    return None
+                host, _, port = rest.split('/')[0].partition(':')
+                return (host, int(port)) if port.isdigit() else (host, 43)
+        return None
+
+    def _whois_lookup(self, address):
+        host, port = CosmicConfig.WHOIS_ROOT_SERVER, 43
+        network, registry, partial = None, None, False
+        for _ in range(CosmicConfig.WHOIS_MAX_REFERRALS + 1):
+            # ARIN needs the "n +" prefix to return network records instead of a summary
+            query = f"n + {address}" if host == 'whois.arin.net' else str(address)
+            try:
+                objects = self._parse_whois(self._whois_query(host, query, port))
+            except OSError:
+                # Keep what earlier servers returned rather than losing the whole lookup
+                if network is None:
+                    raise
+                partial = True
+                break
+            candidate = self._network_object(objects)
+            if candidate:
+                network, registry = candidate, host
+            referral = self._whois_referral(objects)
+            if not referral or referral[0] in ('', host):
+                break
+            host, port = referral
+
+        if network is None:
+            raise RuntimeError(f"no network object returned by {host}")
+        data = {'source': 'WHOIS', 'registry': registry, 'cidr': None,
+                'start_address': None, 'end_address': None, 'partial': partial}
+        for name, keys in self.WHOIS_FIELDS.items():
+            data[name] = next((network[key] for key in keys if network.get(key)), None)
+        block = next((network[key] for key in self.WHOIS_NETWORK_KEYS + ('CIDR',) if network.get(key)), None)
+        if block:
+            data.update(self._whois_block(block))
+        return data
+
+    @staticmethod
+    def _parse_whois(text):
+        """Split a whois response into its objects (blank-line separated key/value blocks)"""
+        objects, fields = [], {}
+        for line in text.splitlines() + ['']:
+            if not line.strip():
+                if fields:
+                    objects.append(fields)
+                    fields = {}
+                continue
+            if line.startswith(('%', '#')) or ':' not in line:
+                continue
+            key, _, value = line.partition(':')
+            key, value = key.strip(), value.strip()
+            # Keep the first value of repeated keys (descr, remarks...)
+            if key and value and key not in fields:
+                fields[key] = value
+        return objects
+
+    @staticmethod
+    def _network_object(objects):
+        """The most specific network object; registries list it last"""
+        networks = [fields for fields in objects
+                    if any(key in fields for key in NebulaRegistry.WHOIS_NETWORK_KEYS)]
+        return networks[-1] if networks else None
+
+    @staticmethod
+    def _whois_block(block):
+        try:
+            if '-' in block:
+                first, last = (part.strip() for part in block.split('-', 1))
+                networks = list(ipaddress.summarize_address_range(
+                    ipaddress.ip_address(first), ipaddress.ip_address(last)))
+            else:
+                networks = [ipaddress.ip_network(part.strip(), strict=False) for part in block.split(',')]
+        except ValueError:
+            return {}
+        return {
+            'start_address': str(networks[0].network_address),
+            'end_address': str(networks[-1].broadcast_address),
+            'cidr': [str(network) for network in networks]
+        }
+
+    # ---------- public API ----------
+    def lookup(self, ip):
+        address = ipaddress.ip_address(ip)
+        data = self.cached(ip)
+        if data is not None:
+            return data
+        try:
+            data = self._rdap_lookup(address)
+        except Exception as rdap_error:
+            try:
+                data = self._whois_lookup(address)
+            except Exception as whois_error:
+                raise RuntimeError(f"RDAP: {rdap_error}; whois: {whois_error}")
+        self._remember(data)
+        return dict(data, cached=False)
+
+    def lookup_many(self, ips):
+        """Resolve many IPs concurrently; returns {ip: registration data or error string}"""
+        results = {}
+        pending = []
+        for ip in dict.fromkeys(ips):
+            try:
+                data = self.cached(ip)
+            except ValueError as e:
+                results[ip] = f"Whois failed: {str(e)}"
+                continue
+            if data is not None:
+                results[ip] = data
+            else:
+                pending.append(ip)
+
+        def worker(ip):
+            try:
+                return self.lookup(ip)
+            except Exception as e:
+                return f"Whois failed: {str(e)}"
+
+        # Sorted order keeps neighbouring addresses together so later ones hit the block cache
+        pending.sort(key=lambda ip: (ipaddress.ip_address(ip).version, int(ipaddress.ip_address(ip))))
+        with ThreadPoolExecutor(max_workers=CosmicConfig.WHOIS_MAX_WORKERS) as executor:
+            for ip, data in zip(pending, executor.map(worker, pending)):
+                results[ip] = data
+        return results
+
+
+class CosmicBeacon:
+    """Public IP resolver that races providers and caches a confirmed answer.
+
+    Only PUBLIC_IP_RACE providers are started at first; the next one is started
+    only when a provider fails or the answers so far disagree. After the first
+    valid answer the resolver waits up to PUBLIC_IP_CONFIRM_WAIT seconds for a
+    second provider to agree; if none has, the next provider is started as a
+    confirmation. A confirmed answer is cached for PUBLIC_IP_TTL seconds, an
+    uncontested single answer for PUBLIC_IP_UNCONFIRMED_TTL, and either until
+    the local interface addresses change.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Headroom for stragglers from a previous call so they don't delay the next one
+        self._executor = ThreadPoolExecutor(max_workers=2 * len(CosmicConfig.PUBLIC_IP_SERVICES))
+        self._session = requests.Session()
+        self._session.headers['User-Agent'] = 'CosmicIPTracker/3.0'
+        self._cached = None  # (ip, expires, interface fingerprint)
+
+    @staticmethod
+    def interface_fingerprint():
+        addresses = []
+        for interface in interfaces():
+            info = ifaddresses(interface)
+            for family in (AF_INET, AF_INET6):
+                for addr in info.get(family, []):
+                    if 'addr' in addr:
+                        addresses.append((interface, family, addr['addr']))
+        return tuple(sorted(addresses))
+
+    def _fetch(self, url, key):
+        response = self._session.get(url, timeout=CosmicConfig.PUBLIC_IP_TIMEOUT)
+        if response.status_code != 200:
+            return None
+        ip = str(response.json().get(key, '')).strip()
+        if GalacticNetwork.validate_ip(ip) and not GalacticNetwork.is_private_ip(ip):
+            return ip
+        return None
+
+    def invalidate(self):
+        with self._lock:
+            self._cached = None
+
+    def resolve(self, force=False):
+        fingerprint = self.interface_fingerprint()
+        with self._lock:
+            if (not force and self._cached and self._cached[1] > time.time()
+                    and self._cached[2] == fingerprint):
+                return self._cached[0]
+
+        providers = iter(CosmicConfig.PUBLIC_IP_SERVICES)
+        pending = {}
+
+        def launch():
+            for url, key in providers:
+                pending[self._executor.submit(self._fetch, url, key)] = url
+                return True
+            return False
+
+        for _ in range(CosmicConfig.PUBLIC_IP_RACE):
+            launch()
+
+        votes, first, deadline = {}, None, None
+        while pending:
+            limit = CosmicConfig.PUBLIC_IP_TIMEOUT + 1 if deadline is None else deadline - time.time()
+            done, _ = wait(pending, timeout=max(limit, 0), return_when=FIRST_COMPLETED)
+            if not done:
+                # The racers are slow to confirm: ask the next provider, or settle
+                if deadline is not None and votes.get(first) == 1 and launch():
+                    deadline = None
+                    continue
+                break
+            for future in done:
+                url = pending.pop(future)
+                try:
+                    ip = future.result()
+                except Exception:
+                    ip = None
+                if not ip:
+                    # A failed provider is replaced by the next one
+                    launch()
+                    continue
+                votes[ip] = votes.get(ip, 0) + 1
+                if first is None:
+                    first, deadline = ip, time.time() + CosmicConfig.PUBLIC_IP_CONFIRM_WAIT
+                elif ip != first:
+                    print(f"{StellarColors.YELLOW}⚠️ Public IP providers disagree: {url} says {ip}, first answer was {first}{StellarColors.RESET}")
+                    # Bring in a tie-breaker
+                    launch()
+            if max(votes.values(), default=0) >= 2:
+                break
+        for future in pending:
+            future.cancel()
+
+        if not votes:
+            return 'Unknown'
+        answer = max(votes, key=lambda ip: (votes[ip], ip == first))
+        if votes[answer] >= 2 or len(votes) == 1:
+            ttl = CosmicConfig.PUBLIC_IP_TTL if votes[answer] >= 2 else CosmicConfig.PUBLIC_IP_UNCONFIRMED_TTL
+            with self._lock:
+                self._cached = (answer, time.time() + ttl, fingerprint)
+        return answer
+
+
+class PathConstellation:
+    """Prefix tree of traceroute paths shared across many targets.
+
+    Every hop is keyed by the first responder's IP ('*' for silent hops), so
+    targets that leave through the same upstream routers share tree nodes and
+    each node counts the targets routed through it. The tree is persisted in
+    EXPORT_DIR as flat parent/hop arrays and loaded on first use; nodes no
+    longer on any stored path are dropped whenever it is written back.
+    """
+
+    SILENT = '*'
+
+    def __init__(self, path=None):
+        self.path = path
+        self.hops = []      # hop key per node; node 0 is the local host
+        self.parents = []   # parent node index, -1 for the root
+        self.children = []  # {hop key: child node index}
+        self.counts = []    # number of stored targets whose path passes through the node
+        self.targets = {}   # target IP -> last node of its path
+        self.loaded = False
+        self.dirty = False
+        self.saved_at = 0
+
+    def _new_node(self, hop, parent):
+        self.hops.append(hop)
+        self.parents.append(parent)
+        self.children.append({})
+        self.counts.append(0)
+        if parent >= 0:
+            self.children[parent][hop] = len(self.hops) - 1
+        return len(self.hops) - 1
+
+    def _store_path(self):
+        return self.path or os.path.join(CosmicConfig.EXPORT_DIR, CosmicConfig.PATH_STORE_FILE)
+
+    def _reset(self):
+        self.hops, self.parents, self.children, self.counts, self.targets = [], [], [], [], {}
+        self._new_node(None, -1)
+
+    def load(self):
+        if self.loaded:
+            return
+        self.loaded = True
+        atexit.register(self.flush, force=True)
+        self._reset()
+        store = self._store_path()
+        try:
+            with open(store) as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            stored = e
+        try:
+            if isinstance(stored, Exception):
+                raise stored
+            for hop, parent in zip(stored['hops'][1:], stored['parents'][1:]):
+                if not 0 <= parent < len(self.hops):
+                    raise ValueError(f"bad parent index {parent}")
+                self._new_node(hop, parent)
+            for target, node in stored['targets'].items():
+                if not 0 <= node < len(self.hops):
+                    raise ValueError(f"bad node index {node} for {target}")
+                if node == 0:
+                    # Written by older versions for traces with no hops; nothing to restore
+                    continue
+                self._walk(node, 1)
+                self.targets[target] = node
+        except (OSError, ValueError, KeyError, TypeError, IndexError, AttributeError) as e:
+            # Keep the unreadable store aside rather than overwriting it on the next save
+            self._reset()
+            try:
+                os.replace(store, store + '.corrupt')
+            except OSError:
+                pass
+            print(f"{StellarColors.YELLOW}⚠️ Ignoring unreadable path store {store}: {e}{StellarColors.RESET}")
+
+    def _compacted(self):
+        """Flat arrays holding only nodes that still lie on a stored path"""
+        remap, hops, parents = {0: 0}, [None], [-1]
+        # Parents are always created before their children, so one pass suffices
+        for node in range(1, len(self.hops)):
+            if self.counts[node] > 0:
+                remap[node] = len(hops)
+                hops.append(self.hops[node])
+                parents.append(remap[self.parents[node]])
+        targets = {target: remap[node] for target, node in self.targets.items()}
+        return hops, parents, targets
+
+    def save(self):
+        """Write the pruned tree atomically and reload the in-memory copy from it"""
+        store = self._store_path()
+        directory = os.path.dirname(store) or '.'
+        os.makedirs(directory, exist_ok=True)
+        hops, parents, targets = self._compacted()
+        fd, temp = tempfile.mkstemp(dir=directory, prefix='.paths-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'hops': hops, 'parents': parents, 'targets': targets}, f)
+            os.replace(temp, store)
+        except BaseException:
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
+        if len(hops) != len(self.hops):
+            self.hops, self.parents, self.children, self.counts, self.targets = [], [], [], [], {}
+            for hop, parent in zip(hops, parents):
+                self._new_node(hop, parent)
+            for target, node in targets.items():
+                self._walk(node, 1)
+                self.targets[target] = node
+        self.dirty = False
+        self.saved_at = time.time()
+
+    def flush(self, force=False):
+        """Save pending paths at most every PATH_STORE_SAVE_INTERVAL seconds (always when forced)"""
+        if self.dirty and (force or time.time() - self.saved_at >= CosmicConfig.PATH_STORE_SAVE_INTERVAL):
+            self.save()
+
+    def _walk(self, node, delta):
+        while node >= 0:
+            self.counts[node] += delta
+            node = self.parents[node]
+
+    def add_path(self, target, hops):
+        """Store the hop records of one traceroute, replacing any earlier path to target"""
+        self.load()
+        target = str(ipaddress.ip_address(target))
+        keys, last_ttl = [], None
+        for hop in hops:
+            # Extra responders (load-balanced probes) at the same TTL don't add depth
+            if last_ttl is not None and hop.get('ttl') == last_ttl:
+                continue
+            last_ttl = hop.get('ttl')
+            # Responders at the target itself are the destination, not infrastructure
+            key = hop.get('ip') or self.SILENT
+            if key == target:
+                break
+            keys.append(key)
+        if not keys:
+            # Nothing upstream to record (empty trace or a directly attached target)
+            return
+        if target in self.targets:
+            self._walk(self.targets[target], -1)
+        node = 0
+        for key in keys:
+            node = self.children[node].get(key) or self._new_node(key, node)
+        self._walk(node, 1)
+        self.targets[target] = node
+        self.dirty = True
+
+    def path_to(self, target):
+        self.load()
+        node, path = self.targets.get(str(ipaddress.ip_address(target))), []
+        while node:
+            path.append(self.hops[node])
+            node = self.parents[node]
+        return path[::-1]
+
+    def shared_paths(self, min_targets=2):
+        """Deepest hop prefixes traversed by at least min_targets targets, busiest first"""
+        self.load()
+        shared = []
+        for node in range(1, len(self.hops)):
+            if self.counts[node] < min_targets:
+                continue
+            if any(self.counts[child] >= min_targets for child in self.children[node].values()):
+                continue
+            prefix, walk = [], node
+            while walk:
+                prefix.append(self.hops[walk])
+                walk = self.parents[walk]
+            shared.append({'hops': prefix[::-1], 'targets': self.counts[node]})
+        return sorted(shared, key=lambda entry: (-entry['targets'], -len(entry['hops'])))
+
+    def hop_popularity(self, min_targets=2):
+        """Responding routers ranked by how many stored targets route through them"""
+        self.load()
+        totals = {}
+        for node in range(1, len(self.hops)):
+            if self.hops[node] != self.SILENT and self.counts[node]:
+                totals[self.hops[node]] = totals.get(self.hops[node], 0) + self.counts[node]
+        return sorted(((hop, count) for hop, count in totals.items() if count >= min_targets),
+                      key=lambda item: -item[1])
+
+
 class GalacticNetwork:
+    registry = NebulaRegistry()
+    beacon = CosmicBeacon()
+    ip_api_lock = threading.Lock()
+    ip_api_next_call = 0.0
+    paths = PathConstellation()
+    UNIX_PROBE = re.compile(r'(?P<host>[^\s()]+) \((?P<ip>[^)]+)\)|(?P<rtt>[\d.]+) ms|(?P<star>\*)|(?<!\S)(?P<bare>[0-9a-fA-F:.]+)(?!\S)')
+    WINDOWS_PROBE = re.compile(r'(?P<rtt><?\d+) ms|(?P<star>\*)|(?P<host>\S+) \[(?P<ip>[^\]]+)\]|(?<!\S)(?P<bare>[0-9a-fA-F:.]+)(?!\S)')
+
     @staticmethod
     def validate_ip(ip):
         ipv4_pattern = r'^((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$'
@@ -113,21 +752,7 @@ class GalacticNetwork:
 
     @staticmethod
     def cosmic_public_ip():
-        services = [
-            'https://api.ipify.org?format=json',
-            'https://ipinfo.io/json',
-            'https://ifconfig.me/all.json'
-        ]
-        with ThreadPoolExecutor() as executor:
-            futures = [executor.submit(requests.get, url, timeout=3) for url in services]
-            for future in futures:
-                try:
-                    result = future.result()
-                    if result.status_code == 200:
-                        return result.json().get('ip', 'Unknown')
-                except:
-                    continue
-        return 'Unknown'
+        return GalacticNetwork.beacon.resolve()
 
     @staticmethod
     def reverse_dns_lookup(ip):
@@ -137,56 +762,357 @@ class GalacticNetwork:
         except (socket.herror, socket.gaierror):
             return "Not found"
 
+    @staticmethod
+    def ip_api_get(url, **kwargs):
+        """GET against ip-api.com, spaced to its free-tier rate limit and backing off when told to"""
+        for _ in range(2):
+            with GalacticNetwork.ip_api_lock:
+                delay = GalacticNetwork.ip_api_next_call - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                response = requests.get(url, **kwargs)
+                # X-Rl is the number of requests left in the window, X-Ttl the seconds until it resets
+                pause = CosmicConfig.IP_API_MIN_INTERVAL
+                if response.status_code == 429 or response.headers.get('X-Rl') == '0':
+                    pause = max(pause, float(response.headers.get('X-Ttl', 60)))
+                GalacticNetwork.ip_api_next_call = time.time() + pause
+            if response.status_code != 429:
+                break
+        return response
+
     @staticmethod
     def get_asn_info(ip):
         try:
-            response = requests.get(f"http://ip-api.com/json/{ip}?fields=as")
+            response = GalacticNetwork.ip_api_get(f"http://ip-api.com/json/{ip}?fields=as", timeout=10)
             data = response.json()
             return data.get('as', 'Unknown')
         except:
             return "ASN lookup failed"
 
     @staticmethod
-    def perform_whois(domain):
+    def perform_whois(ip):
         try:
-            w = whois.whois(domain)
-            # Convert datetime objects to strings
-            whois_data = {
-                'registrar': w.registrar,
-                'name_servers': w.name_servers
-            }
-            # Handle creation_date (could be list or single value)
-            if w.creation_date:
-                if isinstance(w.creation_date, list):
-                    whois_data['creation_date'] = [d.isoformat() if d else None for d in w.creation_date]
-                else:
-                    whois_data['creation_date'] = w.creation_date.isoformat() if w.creation_date else None
-            
-            # Handle expiration_date (could be list or single value)
-            if w.expiration_date:
-                if isinstance(w.expiration_date, list):
-                    whois_data['expiration_date'] = [d.isoformat() if d else None for d in w.expiration_date]
-                else:
-                    whois_data['expiration_date'] = w.expiration_date.isoformat() if w.expiration_date else None
-            
-            return whois_data
+            return GalacticNetwork.registry.lookup(ip)
         except Exception as e:
             return f"Whois failed: {str(e)}"
 
     @staticmethod
-    def cosmic_traceroute(ip):
-        if platform.system() == "Windows":
+    def parse_hop_line(line, windows=False):
+        """Parse one traceroute/tracert output line into hop records, one per responder"""
+        match = re.match(r'^\s*(\d+)\s+(.*)$', line)
+        if not match:
+            return None
+        ttl, rest = int(match.group(1)), match.group(2)
+        hops, pending_rtts = [], []
+        pattern = GalacticNetwork.WINDOWS_PROBE if windows else GalacticNetwork.UNIX_PROBE
+        for probe in pattern.finditer(rest):
+            if probe.group('rtt'):
+                rtt = probe.group('rtt')
+                # tracert reports sub-millisecond replies as "<1 ms"; keep them below 1
+                rtt = float(rtt) if not rtt.startswith('<') else float(rtt[1:]) / 2
+                # traceroute prints RTTs after their responder, tracert before it
+                if hops and not windows:
+                    hops[-1]['rtts'].append(rtt)
+                else:
+                    pending_rtts.append(rtt)
+            elif probe.group('ip') or probe.group('bare'):
+                ip = probe.group('ip') or probe.group('bare')
+                try:
+                    ip = str(ipaddress.ip_address(ip.split('%')[0]))
+                except ValueError:
+                    continue
+                host = probe.group('host')
+                hops.append({'ttl': ttl, 'ip': ip, 'hostname': host if host != ip else None,
+                             'rtts': pending_rtts})
+                pending_rtts = []
+        return hops or [{'ttl': ttl, 'ip': None, 'hostname': None, 'rtts': []}]
+
+    @staticmethod
+    def stream_traceroute(ip):
+        """Run traceroute and yield hop records as lines arrive, stopping early when possible"""
+        # Hop addresses come back compressed, so compare against the same form
+        target = str(ipaddress.ip_address(ip))
+        windows = platform.system() == "Windows"
+        if windows:
             command = ["tracert", "-h", str(CosmicConfig.TRACEROUTE_MAX_HOPS), ip]
         else:
             command = ["traceroute", "-m", str(CosmicConfig.TRACEROUTE_MAX_HOPS), ip]
-        
+
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                   text=True, bufsize=1)
+        silent = 0
+        try:
+            for line in process.stdout:
+                hops = GalacticNetwork.parse_hop_line(line, windows)
+                if not hops:
+                    continue
+                yield from hops
+                if any(hop['ip'] == target for hop in hops):
+                    break
+                silent = silent + 1 if hops[0]['ip'] is None else 0
+                if silent >= CosmicConfig.TRACEROUTE_MAX_SILENT_HOPS:
+                    break
+        finally:
+            if process.poll() is None:
+                process.terminate()
+            try:
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+
+    @staticmethod
+    def cosmic_traceroute(ip):
         try:
             print(f"\n{StellarColors.CYAN}🌀 Launching cosmic traceroute...{StellarColors.RESET}")
-            result = subprocess.run(command, capture_output=True, text=True)
-            return result.stdout
+            return list(GalacticNetwork.stream_traceroute(ip))
         except Exception as e:
             return f"Traceroute failed: {str(e)}"
 
+
+class HyperspaceAtlas:
+    """Vectorized bulk geo/ASN lookups over NumPy arrays of addresses.
+
+    The GeoLite2 databases are flattened once into sorted, coalesced range
+    tables (cached in GEO_TABLE_CACHE next to the databases) and every batch is
+    resolved with np.searchsorted. IPv6 ranges are keyed on the upper 64 bits,
+    which covers every allocation GeoLite2 publishes at /64 or shorter.
+    """
+
+    CITY_COLUMNS = {
+        'country_code': ('<U2', ''),
+        'latitude': ('f8', np.nan),
+        'longitude': ('f8', np.nan),
+        'accuracy_radius': ('u4', 0)
+    }
+    ASN_COLUMNS = {
+        'asn': ('u4', 0)
+    }
+    IPV4_ALIASES = (ipaddress.ip_network('::ffff:0:0/96'), ipaddress.ip_network('2002::/16'))
+    IPV4_COMPAT = ipaddress.ip_network('::/96')
+
+    def __init__(self, city_db=CosmicConfig.GEOIP_DATABASE, asn_db=CosmicConfig.GEOIP_ASN_DATABASE,
+                 cache_path=CosmicConfig.GEO_TABLE_CACHE):
+        self.city_db = city_db
+        self.asn_db = asn_db
+        self.cache_path = cache_path
+        self.tables = None
+
+    # ---------- table preprocessing ----------
+    @staticmethod
+    def _city_values(record):
+        country = record.get('country') or record.get('registered_country') or {}
+        location = record.get('location') or {}
+        return (country.get('iso_code') or '',
+                location.get('latitude', np.nan),
+                location.get('longitude', np.nan),
+                location.get('accuracy_radius') or 0)
+
+    @staticmethod
+    def _asn_values(record):
+        return (record.get('autonomous_system_number') or 0,)
+
+    def _iter_networks(self, path):
+        with maxminddb.open_database(path) as reader:
+            for network, record in reader:
+                if network.version == 6:
+                    if any(network.subnet_of(alias) for alias in self.IPV4_ALIASES):
+                        continue
+                    if network.subnet_of(self.IPV4_COMPAT) and network.prefixlen >= 96:
+                        network = ipaddress.ip_network((int(network.network_address), network.prefixlen - 96))
+                yield network, record
+
+    @staticmethod
+    def _coalesce(starts, ends, columns):
+        """Merge adjacent ranges that carry identical values"""
+        if len(starts) < 2:
+            return starts, ends, columns
+        same = starts[1:] == ends[:-1] + 1
+        for values in columns.values():
+            equal = values[1:] == values[:-1]
+            if values.dtype.kind == 'f':
+                equal |= np.isnan(values[1:]) & np.isnan(values[:-1])
+            same &= equal
+        first = np.concatenate(([True], ~same))
+        heads = np.flatnonzero(first)
+        tails = np.concatenate((heads[1:] - 1, [len(starts) - 1]))
+        return starts[heads], ends[tails], {name: values[heads] for name, values in columns.items()}
+
+    def _build_table(self, path, column_spec, extract):
+        rows = {4: [], 6: []}
+        for network, record in self._iter_networks(path):
+            if network.version == 4:
+                start, end = int(network.network_address), int(network.broadcast_address)
+            else:
+                start, end = int(network.network_address) >> 64, int(network.broadcast_address) >> 64
+            rows[network.version].append((start, end) + extract(record))
+
+        tables = {}
+        for version, key_dtype in ((4, 'u4'), (6, 'u8')):
+            data = rows[version]
+            data.sort(key=lambda row: row[0])
+            starts = np.array([row[0] for row in data], dtype=key_dtype)
+            ends = np.array([row[1] for row in data], dtype=key_dtype)
+            columns = {
+                name: np.array([row[2 + i] for row in data], dtype=dtype)
+                for i, (name, (dtype, _)) in enumerate(column_spec.items())
+            }
+            if version == 6 and len(starts):
+                # Networks longer than /64 collapse onto one key; keep the first
+                starts, unique = np.unique(starts, return_index=True)
+                ends = ends[unique]
+                columns = {name: values[unique] for name, values in columns.items()}
+            starts, ends, columns = self._coalesce(starts, ends, columns)
+            tables[f'v{version}_start'] = starts
+            tables[f'v{version}_end'] = ends
+            for name, values in columns.items():
+                tables[f'v{version}_{name}'] = values
+        return tables
+
+    def _source_stamp(self):
+        stamp = []
+        for path in (self.city_db, self.asn_db):
+            if os.path.exists(path):
+                info = os.stat(path)
+                stamp.extend([info.st_size, int(info.st_mtime)])
+            else:
+                stamp.extend([0, 0])
+        return np.array(stamp, dtype='i8')
+
+    def load(self):
+        if self.tables is not None:
+            return self.tables
+        available = [path for path in (self.city_db, self.asn_db) if os.path.exists(path)]
+        if not available:
+            raise FileNotFoundError(f"No GeoLite2 database found (looked for {self.city_db} and {self.asn_db})")
+        for path in (self.city_db, self.asn_db):
+            if path not in available:
+                print(f"{StellarColors.YELLOW}⚠️ {path} not found; its columns will be empty{StellarColors.RESET}")
+        stamp = self._source_stamp()
+        if os.path.exists(self.cache_path):
+            try:
+                with np.load(self.cache_path) as cached:
+                    if np.array_equal(cached['stamp'], stamp):
+                        self.tables = {name: cached[name] for name in cached.files}
+                        return self.tables
+            except Exception:
+                pass
+
+        tables = {'stamp': stamp}
+        if os.path.exists(self.city_db):
+            for name, values in self._build_table(self.city_db, self.CITY_COLUMNS, self._city_values).items():
+                tables[f'city_{name}'] = values
+        if os.path.exists(self.asn_db):
+            for name, values in self._build_table(self.asn_db, self.ASN_COLUMNS, self._asn_values).items():
+                tables[f'asn_{name}'] = values
+        try:
+            np.savez_compressed(self.cache_path, **tables)
+        except OSError:
+            pass
+        self.tables = tables
+        return tables
+
+    # ---------- address packing ----------
+    @staticmethod
+    def _pack_one(ip):
+        """Slow path for a single entry: returns (version, key) with version 0 if unparsable"""
+        if isinstance(ip, bytes):
+            ip = ip.decode('ascii', errors='replace')
+        if isinstance(ip, (int, np.integer)) and not isinstance(ip, bool):
+            return (4, int(ip)) if 0 <= ip <= 0xFFFFFFFF else (0, 0)
+        if not isinstance(ip, str):
+            return 0, 0
+        ip = ip.strip()
+        for family, version in ((socket.AF_INET, 4), (socket.AF_INET6, 6)):
+            try:
+                packed = socket.inet_pton(family, ip)
+            except OSError:
+                continue
+            return version, int.from_bytes(packed[:8] if version == 6 else packed, 'big')
+        return 0, 0
+
+    @staticmethod
+    def pack_addresses(ips):
+        """Return (version, v4 keys, v6 keys) arrays; version is 0 for unparsable entries"""
+        ips = np.asarray(ips)
+        count = len(ips)
+        versions = np.zeros(count, dtype='u1')
+        v4_keys = np.zeros(count, dtype='u4')
+        v6_keys = np.zeros(count, dtype='u8')
+
+        if ips.dtype.kind in 'iu':
+            if count and (ips.min() < 0 or ips.max() > 0xFFFFFFFF):
+                raise ValueError("packed IPv4 addresses must be within 0..2**32-1")
+            versions[:] = 4
+            v4_keys[:] = ips
+            return versions, v4_keys, v6_keys
+
+        if ips.dtype.kind == 'S':
+            ips = np.char.decode(ips, 'ascii', 'replace')
+
+        # Pack every entry that is a plain IPv4 string in one pass; only the rest
+        # (IPv6, padded or malformed lines, ints in object arrays) take the slow path
+        chunks, retry = [], []
+        inet_pton, af_inet, blank = socket.inet_pton, socket.AF_INET, b'\0\0\0\0'
+        values = ips.tolist()
+        for i, ip in enumerate(values):
+            try:
+                chunks.append(inet_pton(af_inet, ip))
+            except (OSError, TypeError):
+                chunks.append(blank)
+                retry.append(i)
+        versions[:] = 4
+        v4_keys[:] = np.frombuffer(b''.join(chunks), dtype='>u4')
+        for i in retry:
+            version, key = HyperspaceAtlas._pack_one(values[i])
+            versions[i] = version
+            if version == 6:
+                v6_keys[i] = key
+            else:
+                v4_keys[i] = key
+        return versions, v4_keys, v6_keys
+
+    # ---------- lookups ----------
+    @staticmethod
+    def _search(starts, ends, keys):
+        if not len(starts):
+            return np.full(len(keys), -1, dtype='i8')
+        idx = np.searchsorted(starts, keys, side='right') - 1
+        safe = np.maximum(idx, 0)
+        hit = (idx >= 0) & (keys <= ends[safe])
+        return np.where(hit, idx, -1)
+
+    def _resolve(self, prefix, column_spec, versions, keys_by_version, out):
+        tables = self.tables
+        for version, keys in keys_by_version.items():
+            if f'{prefix}_v{version}_start' not in tables:
+                continue
+            mask = versions == version
+            idx = self._search(tables[f'{prefix}_v{version}_start'],
+                               tables[f'{prefix}_v{version}_end'], keys[mask])
+            found = idx >= 0
+            rows = np.flatnonzero(mask)[found]
+            for name in column_spec:
+                out[name][rows] = tables[f'{prefix}_v{version}_{name}'][idx[found]]
+
+    def bulk_lookup(self, ips):
+        """Resolve an array of IPs (strings or packed IPv4 integers) into columnar arrays"""
+        self.load()
+        ips = np.asarray(ips)
+        versions, v4_keys, v6_keys = self.pack_addresses(ips)
+        count = len(ips)
+
+        # Object arrays would need pickling in NPZ exports
+        columns = {'ip': ips.astype(str) if ips.dtype == object else ips}
+        for name, (dtype, missing) in {**self.CITY_COLUMNS, **self.ASN_COLUMNS}.items():
+            columns[name] = np.full(count, missing, dtype=dtype)
+        keys_by_version = {4: v4_keys, 6: v6_keys}
+        self._resolve('city', self.CITY_COLUMNS, versions, keys_by_version, columns)
+        self._resolve('asn', self.ASN_COLUMNS, versions, keys_by_version, columns)
+        return columns
+
+
 # ==================== DISPLAY FUNCTIONS ====================
 def display_cosmic_banner():
     os.system('cls' if os.name == 'nt' else 'clear')
@@ -316,8 +1242,38 @@ def serialize_complex(obj):
         return {k: serialize_complex(v) for k, v in obj.items()}
     elif hasattr(obj, '__dict__'):
         return serialize_complex(vars(obj))
+    elif obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
     return str(obj)
 
+def display_traceroute_hops(hops):
+    if not isinstance(hops, list):
+        print(hops)
+        return
+    for hop in hops:
+        if hop['ip'] is None:
+            print(f"{StellarColors.CYAN}{hop['ttl']:>3}  {StellarColors.YELLOW}*{StellarColors.RESET}")
+            continue
+        name = f"{hop['hostname']} ({hop['ip']})" if hop['hostname'] else hop['ip']
+        rtts = '  '.join(f"{rtt:.3f} ms" for rtt in hop['rtts'])
+        print(f"{StellarColors.CYAN}{hop['ttl']:>3}  {StellarColors.WHITE}{name}  {StellarColors.GREEN}{rtts}{StellarColors.RESET}")
+
+def display_shared_paths(min_targets=2):
+    paths = GalacticNetwork.paths
+    paths.load()
+    print(f"\n{StellarColors.PURPLE}🛰  [ Shared Upstream Paths - {len(paths.targets)} targets traced ]{StellarColors.RESET}")
+    
+    shared = paths.shared_paths(min_targets)
+    if not shared:
+        print(f"{StellarColors.YELLOW}No hop prefixes shared by {min_targets}+ targets yet{StellarColors.RESET}")
+        return
+    for entry in shared:
+        print(f"{StellarColors.GREEN}{entry['targets']} targets: {StellarColors.WHITE}{' → '.join(entry['hops'])}{StellarColors.RESET}")
+    
+    print(f"\n{StellarColors.CYAN}Busiest routers:{StellarColors.RESET}")
+    for hop, count in paths.hop_popularity(min_targets)[:20]:
+        print(f"{StellarColors.WHITE}- {hop} {StellarColors.GREEN}({count} targets){StellarColors.RESET}")
+
 def display_cosmic_insights(data: Dict):
     print(f"\n{StellarColors.PURPLE}✨ [ Cosmic Insights ]{StellarColors.RESET}")
     print(f"{StellarColors.CYAN}Reverse DNS: {StellarColors.WHITE}{data.get('reverse_dns', 'N/A')}{StellarColors.RESET}")
@@ -327,33 +1283,29 @@ def display_cosmic_insights(data: Dict):
     if isinstance(data.get('whois'), dict):
         print(f"\n{StellarColors.CYAN}Whois Information:{StellarColors.RESET}")
         whois_data = data['whois']
-        print(f"{StellarColors.CYAN}Registrar: {StellarColors.WHITE}{whois_data.get('registrar', 'N/A')}{StellarColors.RESET}")
+        print(f"{StellarColors.CYAN}Registry: {StellarColors.WHITE}{whois_data.get('registry', 'N/A')} ({whois_data.get('source', 'N/A')}){StellarColors.RESET}")
+        print(f"{StellarColors.CYAN}Network: {StellarColors.WHITE}{whois_data.get('network_name', 'N/A')} [{whois_data.get('handle', 'N/A')}]{StellarColors.RESET}")
+        print(f"{StellarColors.CYAN}Organization: {StellarColors.WHITE}{whois_data.get('org', 'N/A')}{StellarColors.RESET}")
+        print(f"{StellarColors.CYAN}Country: {StellarColors.WHITE}{whois_data.get('country', 'N/A')}{StellarColors.RESET}")
         
-        # Handle creation date (could be list or single value)
-        creation_date = whois_data.get('creation_date')
-        if creation_date:
-            if isinstance(creation_date, list):
-                creation_date = creation_date[0] if creation_date else None
-            print(f"{StellarColors.CYAN}Creation Date: {StellarColors.WHITE}{creation_date}{StellarColors.RESET}")
+        # Allocated block, shown as CIDRs when the registry provides them
+        cidr = whois_data.get('cidr')
+        if cidr:
+            print(f"{StellarColors.CYAN}Block: {StellarColors.WHITE}{', '.join(cidr)}{StellarColors.RESET}")
+        elif whois_data.get('start_address'):
+            print(f"{StellarColors.CYAN}Block: {StellarColors.WHITE}{whois_data['start_address']} - {whois_data.get('end_address')}{StellarColors.RESET}")
         
-        # Handle expiration date (could be list or single value)
-        expiration_date = whois_data.get('expiration_date')
-        if expiration_date:
-            if isinstance(expiration_date, list):
-                expiration_date = expiration_date[0] if expiration_date else None
-            print(f"{StellarColors.CYAN}Expiration Date: {StellarColors.WHITE}{expiration_date}{StellarColors.RESET}")
-        
-        # Display name servers if available
-        name_servers = whois_data.get('name_servers')
-        if name_servers:
-            print(f"{StellarColors.CYAN}Name Servers:{StellarColors.RESET}")
-            for ns in (name_servers if isinstance(name_servers, list) else [name_servers]):
-                print(f"{StellarColors.WHITE}- {ns}{StellarColors.RESET}")
+        if whois_data.get('creation_date'):
+            print(f"{StellarColors.CYAN}Creation Date: {StellarColors.WHITE}{whois_data['creation_date']}{StellarColors.RESET}")
+        if whois_data.get('last_changed'):
+            print(f"{StellarColors.CYAN}Last Changed: {StellarColors.WHITE}{whois_data['last_changed']}{StellarColors.RESET}")
+    elif data.get('whois'):
+        print(f"{StellarColors.YELLOW}{data['whois']}{StellarColors.RESET}")
     
     # Display traceroute results if requested
     if input(f"\n{StellarColors.YELLOW}Show traceroute results? (y/n): {StellarColors.RESET}").lower() == 'y':
         print(f"\n{StellarColors.CYAN}🌀 Traceroute Results:{StellarColors.RESET}")
-        print(data.get('traceroute', 'N/A'))
+        display_traceroute_hops(data.get('traceroute', 'N/A'))
 
 def log_cosmic_journey(data: Dict):
     """Save tracking data to JSON log file with proper serialization"""
@@ -420,14 +1372,59 @@ def offer_data_export(data: Dict):
     except Exception as e:
         print(f"{StellarColors.RED}Failed to create CSV: {e}{StellarColors.RESET}")
 
+def export_columnar_report(columns: Dict, filename: Optional[str] = None, part: Optional[int] = None):
+    """Export columnar arrays (e.g. HyperspaceAtlas.bulk_lookup output) to CSV and NPZ.
+
+    With part set, each chunk goes to its own NPZ file and is appended to one CSV.
+    """
+    if filename is None:
+        filename = f"ip_bulk_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    os.makedirs(CosmicConfig.EXPORT_DIR, exist_ok=True)
+
+    # NPZ Export - keeps the arrays as-is for further analysis
+    npz_name = filename if part is None else f"{filename}_part{part:03d}"
+    npz_path = os.path.join(CosmicConfig.EXPORT_DIR, f"{npz_name}.npz")
+    try:
+        np.savez_compressed(npz_path, **columns)
+        print(f"{StellarColors.GREEN}NPZ report saved to {npz_path}{StellarColors.RESET}")
+    except Exception as e:
+        print(f"{StellarColors.RED}Failed to create NPZ: {e}{StellarColors.RESET}")
+
+    # CSV Export - missing values (NaN / 0) become empty cells
+    csv_path = os.path.join(CosmicConfig.EXPORT_DIR, f"{filename}.csv")
+    try:
+        text_columns = []
+        for values in columns.values():
+            values = np.asarray(values)
+            text = values.astype(str)
+            if values.dtype.kind == 'f':
+                text[np.isnan(values)] = ''
+            elif values.dtype.kind == 'u':
+                text[values == 0] = ''
+            text_columns.append(text)
+        with open(csv_path, 'w' if not part else 'a', newline='') as f:
+            writer = csv.writer(f)
+            if not part:
+                writer.writerow(columns.keys())
+            writer.writerows(zip(*text_columns))
+        print(f"{StellarColors.GREEN}CSV report saved to {csv_path}{StellarColors.RESET}")
+    except Exception as e:
+        print(f"{StellarColors.RED}Failed to create CSV: {e}{StellarColors.RESET}")
+
 # ==================== CORE TRACKING FUNCTION ====================
-def track_across_dimensions(ip, country_name):
+def track_across_dimensions(ip, country_name, interactive=True, whois=None):
+    """Enrich and log one IP; returns True, or the collected data when not interactive.
+
+    Non-interactive calls don't log; the caller decides whether the result is worth
+    keeping. whois takes a registration result fetched ahead of time (e.g. by a
+    batch lookup).
+    """
     if not GalacticNetwork.validate_ip(ip):
         print(f"\n{StellarColors.RED}⚠ Invalid IP address format!{StellarColors.RESET}")
         return False
     
     if GalacticNetwork.is_private_ip(ip):
-        return show_local_network_crystals(ip, country_name)
+        return show_local_network_crystals(ip, country_name) if interactive else False
     
     try:
         cosmic_data = {
@@ -452,14 +1449,15 @@ def track_across_dimensions(ip, country_name):
                     'accuracy': response.location.accuracy_radius
                 }
                 cosmic_data['sources'].append(geoip_data)
-                display_geoip_results(geoip_data, country_name)
+                if interactive:
+                    display_geoip_results(geoip_data, country_name)
         except Exception as geoip_error:
             pass
         
         # Try IP-API
         try:
             headers = {'User-Agent': 'CosmicIPTracker/3.0'}
-            response = requests.get(CosmicConfig.IP_API_URL.format(ip=ip), headers=headers, timeout=10)
+            response = GalacticNetwork.ip_api_get(CosmicConfig.IP_API_URL.format(ip=ip), headers=headers, timeout=10)
             api_data = response.json()
             
             if api_data.get('status') == 'success':
@@ -478,17 +1476,30 @@ def track_across_dimensions(ip, country_name):
                     'reverse_dns': api_data.get('reverse')
                 }
                 cosmic_data['sources'].append(ipapi_data)
-                display_ipapi_results(ipapi_data, country_name)
+                if interactive:
+                    display_ipapi_results(ipapi_data, country_name)
         except Exception as api_error:
             pass
         
         # Additional cosmic data
         cosmic_data.update({
             'reverse_dns': GalacticNetwork.reverse_dns_lookup(ip),
-            'asn_info': GalacticNetwork.get_asn_info(ip),
-            'whois': GalacticNetwork.perform_whois(ip),
-            'traceroute': GalacticNetwork.cosmic_traceroute(ip)
+            # IP-API already returned the AS; don't spend a second rate-limited call on it
+            'asn_info': next((source['as'] for source in cosmic_data['sources'] if source.get('as')), None)
+                        or GalacticNetwork.get_asn_info(ip),
+            'whois': whois if whois is not None else GalacticNetwork.perform_whois(ip)
         })
+        if interactive or CosmicConfig.WATCH_TRACEROUTE:
+            cosmic_data['traceroute'] = GalacticNetwork.cosmic_traceroute(ip)
+            if isinstance(cosmic_data['traceroute'], list):
+                try:
+                    GalacticNetwork.paths.add_path(ip, cosmic_data['traceroute'])
+                    GalacticNetwork.paths.flush()
+                except Exception as e:
+                    print(f"{StellarColors.YELLOW}⚠️ Path store update failed: {e}{StellarColors.RESET}")
+        
+        if not interactive:
+            return cosmic_data
         
         display_cosmic_insights(cosmic_data)
         log_cosmic_journey(cosmic_data)
@@ -500,6 +1511,273 @@ def track_across_dimensions(ip, country_name):
         print(f"\n{StellarColors.RED}Cosmic Tracking Error: {e}{StellarColors.RESET}")
         return False
 
+# ==================== FEED WATCH ====================
+class BloomFilter:
+    """Fixed-size probabilistic set: no false negatives, ~error_rate false positives"""
+
+    def __init__(self, capacity, error_rate):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class EventHorizonWatcher:
+    """Tail abuse feed files/directories and enrich only new or expired IPs.
+
+    Files are followed tail-style by byte offset (rotation and truncation
+    restart from the top), so memory stays flat however large the feeds grow.
+    Every successfully enriched IP is kept on disk in WATCH_STATE_DB with its
+    enrichment time and last ASN/country, refreshed from the result log on
+    start; a Bloom filter in front of it answers "never seen" without a query.
+    Expired IPs are re-enriched and ASN/country changes are emitted as deltas.
+    """
+
+    # IPv4 may carry a :port or end a sentence; IPv6 may be compressed (a::1, ::ffff:1.2.3.4).
+    # Candidates are loose on purpose and checked with ipaddress in read_new_ips.
+    IP_CANDIDATE = re.compile(
+        r'(?<![\w.:])(?:\d{1,3}\.){3}\d{1,3}(?=:\d{1,5}(?!\d)|\.(?!\w)|[^\w.:]|$)'
+        r'|(?<![\w:])(?:[0-9a-fA-F]{0,4}:){2,7}(?:(?:\d{1,3}\.){3}\d{1,3}|[0-9a-fA-F]{1,4})?(?![\w:])'
+    )
+
+    def __init__(self, paths, country_name="Feed Watch"):
+        self.paths = paths
+        self.country_name = country_name
+        self.seen = BloomFilter(CosmicConfig.WATCH_BLOOM_CAPACITY, CosmicConfig.WATCH_BLOOM_ERROR_RATE)
+        self.offsets = {}  # path -> (inode, byte offset)
+        self.log_path = os.path.join(CosmicConfig.EXPORT_DIR, CosmicConfig.LOG_FILE)
+        self.delta_path = os.path.join(CosmicConfig.EXPORT_DIR, CosmicConfig.DELTA_LOG)
+        self.state_path = os.path.join(CosmicConfig.EXPORT_DIR, CosmicConfig.WATCH_STATE_DB)
+        self.state = None
+
+    # ---------- seen-set ----------
+    @staticmethod
+    def iter_log_entries(path):
+        """Stream the concatenated JSON entries written by log_cosmic_journey"""
+        decoder = json.JSONDecoder()
+        buffer = ''
+        with open(path) as f:
+            for chunk in iter(lambda: f.read(65536), ''):
+                buffer += chunk
+                pos = 0
+                while True:
+                    while pos < len(buffer) and buffer[pos].isspace():
+                        pos += 1
+                    try:
+                        entry, pos = decoder.raw_decode(buffer, pos)
+                    except json.JSONDecodeError:
+                        # A torn entry (e.g. an interrupted write) is skipped once a
+                        # complete entry follows it; otherwise wait for more data
+                        resume = buffer.find('\n{', pos + 1)
+                        if resume == -1:
+                            break
+                        try:
+                            decoder.raw_decode(buffer, resume + 1)
+                        except json.JSONDecodeError:
+                            break
+                        pos = resume + 1
+                        continue
+                    yield entry
+                buffer = buffer[pos:]
+
+    @staticmethod
+    def summarize(data):
+        """Extract the (asn, country) pair that deltas are computed on"""
+        asn = re.match(r'AS\d+', str(data.get('asn_info') or ''))
+        country = None
+        for source in data.get('sources', []):
+            if source.get('country') not in (None, '', 'None'):
+                country = source['country']
+                break
+        return (asn.group(0) if asn else None), country
+
+    def open_state(self):
+        self.state = sqlite3.connect(self.state_path)
+        self.state.execute(
+            "CREATE TABLE IF NOT EXISTS enriched ("
+            "ip TEXT PRIMARY KEY, enriched_at REAL, asn TEXT, country TEXT)"
+        )
+        for (ip,) in self.state.execute("SELECT ip FROM enriched"):
+            self.seen.add(ip)
+
+    def remember(self, ip, enriched_at, asn, country, commit=True):
+        self.seen.add(ip)
+        self.state.execute(
+            "INSERT INTO enriched VALUES (?, ?, ?, ?) ON CONFLICT(ip) DO UPDATE SET "
+            "enriched_at = excluded.enriched_at, asn = excluded.asn, country = excluded.country "
+            "WHERE excluded.enriched_at >= enriched.enriched_at",
+            (ip, enriched_at, asn, country)
+        )
+        if commit:
+            self.state.commit()
+
+    def lookup_state(self, ip):
+        """(enriched_at, asn, country) of the last successful enrichment, or None"""
+        return self.state.execute(
+            "SELECT enriched_at, asn, country FROM enriched WHERE ip = ?", (ip,)
+        ).fetchone()
+
+    def load_seen(self):
+        if self.state is None:
+            self.open_state()
+        if not os.path.exists(self.log_path):
+            return 0
+        count = 0
+        for entry in self.iter_log_entries(self.log_path):
+            data = entry.get('data') or {}
+            ip = data.get('ip')
+            asn, country = self.summarize(data)
+            # Failed enrichments in the log don't count as seen
+            if not ip or not (asn or country):
+                continue
+            try:
+                enriched_at = datetime.fromisoformat(entry.get('timestamp')).timestamp()
+            except (TypeError, ValueError):
+                enriched_at = 0
+            self.remember(ip, enriched_at, asn, country, commit=False)
+            count += 1
+        self.state.commit()
+        return count
+
+    # ---------- tailing ----------
+    @staticmethod
+    def normalize(candidate):
+        """Public address in the form validate_ip accepts (IPv6 fully expanded), or None"""
+        try:
+            address = ipaddress.ip_address(candidate)
+        except ValueError:
+            return None
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if address.is_private or address.is_multicast or address.is_unspecified:
+            return None
+        return address.exploded if address.version == 6 else str(address)
+
+    def _discover(self):
+        # Never tail our own logs, deltas and state when watching a parent directory
+        own = os.path.realpath(CosmicConfig.EXPORT_DIR)
+        for path in self.paths:
+            if os.path.isdir(path):
+                for root, dirs, files in os.walk(path):
+                    if os.path.realpath(root) == own:
+                        dirs[:] = []
+                        continue
+                    dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+                    for name in sorted(files):
+                        if not name.startswith('.'):
+                            yield os.path.join(root, name)
+            elif os.path.isfile(path):
+                yield path
+
+    def read_new_ips(self):
+        """Yield IPs from lines appended since the last poll"""
+        live = set()
+        for path in self._discover():
+            live.add(path)
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            inode, offset = self.offsets.get(path, (info.st_ino, 0))
+            if inode != info.st_ino or info.st_size < offset:
+                inode, offset = info.st_ino, 0
+            if info.st_size > offset:
+                with open(path, 'rb') as f:
+                    f.seek(offset)
+                    for line in f:
+                        # Leave a partially written last line for the next poll
+                        if not line.endswith(b'\n'):
+                            break
+                        offset += len(line)
+                        self.offsets[path] = (inode, offset)
+                        for match in self.IP_CANDIDATE.finditer(line.decode('utf-8', errors='replace')):
+                            ip = self.normalize(match.group(0))
+                            if ip:
+                                yield ip
+            self.offsets[path] = (inode, offset)
+        for path in set(self.offsets) - live:
+            del self.offsets[path]
+
+    # ---------- enrichment ----------
+    def needs_enrichment(self, ip):
+        if ip not in self.seen:
+            return True
+        # The Bloom filter can give false positives; the state store is authoritative
+        record = self.lookup_state(ip)
+        return record is None or time.time() - record[0] > CosmicConfig.WATCH_ENRICH_TTL
+
+    def emit_delta(self, ip, field, old, new):
+        delta = {'timestamp': datetime.now().isoformat(), 'ip': ip, 'field': field, 'old': old, 'new': new}
+        print(f"{StellarColors.PURPLE}Δ {ip} {field}: {StellarColors.WHITE}{old} → {new}{StellarColors.RESET}")
+        try:
+            with open(self.delta_path, 'a') as f:
+                f.write(json.dumps(delta) + '\n')
+        except Exception as e:
+            print(f"{StellarColors.RED}Failed to log delta: {e}{StellarColors.RESET}")
+        return delta
+
+    def process(self, ip, whois=None):
+        if GalacticNetwork.is_private_ip(ip) or not self.needs_enrichment(ip):
+            return None
+        previous = self.lookup_state(ip)
+        data = track_across_dimensions(ip, self.country_name, interactive=False, whois=whois)
+        if not isinstance(data, dict):
+            return None
+        asn, country = self.summarize(data)
+        if not (asn or country):
+            # Rate-limited or failed lookup: not remembered, so the next sighting retries it
+            print(f"{StellarColors.YELLOW}? {ip} enrichment failed, will retry when seen again{StellarColors.RESET}")
+            return None
+        log_cosmic_journey(data)
+        if previous is None:
+            print(f"{StellarColors.GREEN}+ {ip} {StellarColors.WHITE}{asn or 'N/A'} {country or 'N/A'}{StellarColors.RESET}")
+        else:
+            for field, old, new in (('asn', previous[1], asn), ('country', previous[2], country)):
+                if old and new and old != new:
+                    self.emit_delta(ip, field, old, new)
+        self.remember(ip, time.time(), asn, country)
+        return data
+
+    def process_batch(self, ips):
+        # Registration data is fetched concurrently for the whole batch up front
+        whois = GalacticNetwork.registry.lookup_many(ips)
+        return sum(1 for ip in ips if self.process(ip, whois.get(ip)) is not None)
+
+    def poll(self):
+        processed, batch = 0, []
+        for ip in self.read_new_ips():
+            if ip in batch or GalacticNetwork.is_private_ip(ip) or not self.needs_enrichment(ip):
+                continue
+            batch.append(ip)
+            if len(batch) >= CosmicConfig.WATCH_BATCH_SIZE:
+                processed += self.process_batch(batch)
+                batch = []
+        if batch:
+            processed += self.process_batch(batch)
+        return processed
+
+    def watch(self):
+        os.makedirs(CosmicConfig.EXPORT_DIR, exist_ok=True)
+        self.open_state()
+        known = self.load_seen()
+        print(f"{StellarColors.CYAN}🛰  Watching {', '.join(self.paths)} ({known} logged lookups loaded){StellarColors.RESET}")
+        while True:
+            self.poll()
+            time.sleep(CosmicConfig.WATCH_POLL_INTERVAL)
+
+
 # ==================== MAIN COSMIC FLOW ====================
 def main():
     try:
@@ -547,17 +1825,42 @@ def main():
         QuantumMagic.animate_creation(f"\n{StellarColors.RED}Cosmic journey interrupted!{StellarColors.RESET}")
         sys.exit(0)
 
+def run_bulk_geo(path):
+    """Resolve every address in a file (one per line) chunk by chunk and export the columns"""
+    atlas = HyperspaceAtlas()
+    try:
+        atlas.load()
+    except FileNotFoundError as e:
+        print(f"{StellarColors.RED}Bulk lookup needs a GeoLite2 database: {e}{StellarColors.RESET}")
+        return False
+    filename = f"ip_bulk_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    part, total = 0, 0
+    # Undecodable bytes only spoil their own line, which then resolves as unparsable
+    with open(path, errors='replace') as f:
+        while True:
+            lines = [line.strip() for line in itertools.islice(f, CosmicConfig.BULK_GEO_CHUNK)]
+            if not lines:
+                break
+            ips = np.array([line for line in lines if line])
+            if len(ips):
+                print(f"{StellarColors.CYAN}🌍 Resolving addresses {total + 1}-{total + len(ips)}...{StellarColors.RESET}")
+                export_columnar_report(atlas.bulk_lookup(ips), filename, part)
+                part += 1
+                total += len(ips)
+    return True
+
 if __name__ == '__main__':
     try:
         import geoip2
         import pyfiglet
         import netifaces
-        import whois
         import dns
         import tqdm
+        import maxminddb
+        import numpy
     except ImportError as e:
         print(f"{StellarColors.RED}Missing cosmic component: {e}{StellarColors.RESET}")
-        print(f"{StellarColors.YELLOW}Run: pip install geoip2 pyfiglet netifaces python-whois dnspython tqdm{StellarColors.RESET}")
+        print(f"{StellarColors.YELLOW}Run: pip install geoip2 pyfiglet netifaces dnspython tqdm numpy{StellarColors.RESET}")
         sys.exit(1)
     
     if not os.path.exists(CosmicConfig.GEOIP_DATABASE):
@@ -565,4 +1868,27 @@ if __name__ == '__main__':
         print(f"{StellarColors.CYAN}https://dev.maxmind.com/geoip/geolite2-free-geolocation-data{StellarColors.RESET}")
         print(f"{StellarColors.PURPLE}Place the .mmdb file in the same directory as this script{StellarColors.RESET}")
     
+    parser = argparse.ArgumentParser(description="Cosmic IP Tracker")
+    parser.add_argument('--bulk-geo', metavar='FILE',
+                        help="resolve geo/ASN for every IP in FILE (one per line) and export CSV/NPZ")
+    parser.add_argument('--watch', metavar='PATH', nargs='+',
+                        help="follow feed files/directories and enrich only new or expired IPs")
+    parser.add_argument('--shared-paths', metavar='N', type=int, nargs='?', const=2,
+                        help="show traceroute hops shared by at least N traced targets (default 2)")
+    args = parser.parse_args()
+    
+    if args.bulk_geo:
+        sys.exit(0 if run_bulk_geo(args.bulk_geo) else 1)
+    
+    if args.shared_paths is not None:
+        display_shared_paths(args.shared_paths)
+        sys.exit(0)
+    
+    if args.watch:
+        try:
+            EventHorizonWatcher(args.watch).watch()
+        except KeyboardInterrupt:
+            QuantumMagic.animate_creation(f"\n{StellarColors.RED}Feed watch stopped!{StellarColors.RESET}")
+        sys.exit(0)
+    
     main()
\ No newline at end of file